@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the memory used per record by the messages sync pipeline, comparing
+a frozen copy of the original pipeline against the current one.
+
+    pip install -e .
+    python benchmarks/record_pipeline.py [--pages 20] [--rows 100] [--fields 100]
+
+Each pipeline runs in its own process so that peak RSS can be compared. Pages are
+decoded from JSON on each request, as resp.json() would, and for each pipeline
+the following are reported:
+- bytes per record: the median increase in traced memory while emitting a record,
+  i.e. the transient copies made per row
+- mean live bytes: the mean traced memory when each record is written, which drops
+  when emitted records and pages are released
+- peak traced bytes and peak RSS
+"""
+import argparse
+import gc
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from unittest import mock
+
+import singer
+from singer import metadata
+from singer.catalog import CatalogEntry
+from singer.schema import Schema
+
+from tap_gorgias.client import GorgiasAPI, add_url_params
+from tap_gorgias.streams import Messages
+from tap_gorgias.sync import sync_stream
+
+LOGGER = singer.get_logger()
+CONFIG = {'username': 'user', 'password': 'password', 'subdomain': 'example'}
+BOOKMARK = '2023-01-01T00:00:00Z'
+
+
+def wide_row(i, fields):
+    row = {f'field_{n}': f'value {i} {n}' for n in range(fields)}
+    row.update({
+        'id': i,
+        'created_datetime': f'2024-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}+00:00',
+        'sent_datetime': '2024-01-01T00:00:00+00:00',
+        'failed_datetime': None,
+    })
+    return row
+
+
+def catalog_entry(row):
+    properties = {k: {'type': ['null', 'string', 'integer']} for k in row}
+    schema = Schema.from_dict({'type': 'object', 'properties': properties})
+    return CatalogEntry(
+        tap_stream_id='messages',
+        stream='messages',
+        schema=schema,
+        key_properties=['id'],
+        metadata=metadata.get_standard_metadata(schema=schema.to_dict(), key_properties=['id']),
+    )
+
+
+def original_cursor_get(self, url, query_params):
+    # A copy of CursorStream.cursor_get before pages were released as records were emitted
+    updated_url = add_url_params(url, query_params)
+    cursors_seen = set()
+    def _get_page(cursor=None):
+        cursors_seen.add(cursor)
+        # Since the URL doesn't change, don't make logs on each request
+        if cursor:
+            new_url = add_url_params(url, {**query_params, "cursor": cursor})
+        else:
+            new_url = updated_url
+        log_on_request = cursor is None
+        if self.uses_cursor_bookmark:
+            log_on_request = True
+        return self.client.get(new_url, make_log_on_request=log_on_request)
+
+    next_cursor = query_params.get("cursor")
+    if next_cursor:
+        cursors_seen.add(None)
+
+    while next_cursor not in cursors_seen:
+        # pass an empty cursor to begin
+        data = _get_page(next_cursor)
+        records = data.get(self.results_key)
+        try:
+            # For each page, log the date range of this page
+            page_start_date, page_end_date = (
+                records[0][self.replication_key],
+                records[-1][self.replication_key]
+            )
+            LOGGER.info(f'Fetched {self.name} between {page_start_date} and {page_end_date}')
+        except:
+            pass
+
+        for record in records:
+            if self.uses_cursor_bookmark:
+                yield (record, next_cursor)
+            else:
+                yield record
+        next_cursor = data['meta'].get('next_cursor')
+
+
+def original_pipeline(instance, state):
+    # A copy of Messages.sync and sync_stream before records were transformed in place
+    # and the transformer, schema and metadata were built once per stream
+    sync_thru, max_synced_thru = instance.get_sync_thru_dates(state)
+    stream = instance.stream
+    for row in original_cursor_get(instance, instance.url, {'limit': 100, 'order_by': 'created_datetime:desc'}):
+        message = {k: instance.transform_value(k, v) for (k, v) in row.items()}
+        max_synced_thru = max(message[instance.replication_key], max_synced_thru)
+        if message[instance.replication_key] <= sync_thru:
+            break
+        with singer.Transformer() as transformer:
+            rec = transformer.transform(message, stream.schema.to_dict(), metadata=metadata.to_map(stream.metadata))
+        singer.write_record(stream.tap_stream_id, rec)
+    instance.update_bookmark(state, max_synced_thru)
+
+
+def current_pipeline(instance, state):
+    sync_stream(state, BOOKMARK, instance, {})
+
+
+PIPELINES = {'original': original_pipeline, 'current': current_pipeline}
+
+
+def run(pipeline_name, pages, rows, fields):
+    """ Runs a pipeline over the synthetic pages and returns its measurements. """
+    row_count = pages * rows
+    # Rows are newest first, as the messages stream requests them
+    encoded_pages = [
+        json.dumps({
+            'data': [wide_row(row_count - (p * rows + r), fields) for r in range(rows)],
+            'meta': {'next_cursor': f'c{p + 1}' if p + 1 < pages else None},
+        })
+        for p in range(pages)
+    ]
+    cursors = {None: 0, **{f'c{p}': p for p in range(1, pages)}}
+
+    def get(url, make_log_on_request=True):
+        cursor = url.split('cursor=')[1].split('&')[0] if 'cursor=' in url else None
+        return json.loads(encoded_pages[cursors[cursor]])
+
+    client = GorgiasAPI(CONFIG)
+    instance = Messages(client)
+    instance.stream = catalog_entry(wide_row(0, fields))
+    state = {'bookmarks': {'messages': {'created_datetime': BOOKMARK}}}
+
+    record_bytes, live_bytes = [], []
+    window_start = [0]
+
+    def write_record(*args, **kwargs):
+        current, peak = tracemalloc.get_traced_memory()
+        record_bytes.append(peak - window_start[0])
+        live_bytes.append(current)
+        window_start[0] = current
+        tracemalloc.reset_peak()
+
+    with mock.patch.object(client, 'get', side_effect=get), \
+            mock.patch('singer.write_record', write_record), \
+            mock.patch('singer.write_state', lambda *args, **kwargs: None):
+        gc.collect()
+        gc.disable()
+        tracemalloc.start()
+        try:
+            PIPELINES[pipeline_name](instance, state)
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max([peak] + live_bytes)
+        finally:
+            tracemalloc.stop()
+            gc.enable()
+
+    assert len(record_bytes) == row_count, f'{pipeline_name} emitted {len(record_bytes)} of {row_count} records'
+    return {
+        'bytes_per_record': statistics.median(record_bytes),
+        'mean_live_bytes': statistics.mean(live_bytes),
+        'peak_traced_bytes': peak,
+        # NB: ru_maxrss is in kilobytes on linux
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--fields', type=int, default=100)
+    parser.add_argument('--pipeline', choices=PIPELINES, help='Run a single pipeline and print its results')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    if args.pipeline:
+        json.dump(run(args.pipeline, args.pages, args.rows, args.fields), sys.stdout)
+        return
+
+    for pipeline_name in PIPELINES:
+        output = subprocess.run(
+            [sys.executable, __file__, '--pipeline', pipeline_name,
+             '--pages', str(args.pages), '--rows', str(args.rows), '--fields', str(args.fields)],
+            check=True, stdout=subprocess.PIPE
+        ).stdout
+        result = json.loads(output)
+        LOGGER.info(
+            f'{pipeline_name}: {result["bytes_per_record"]:.0f} bytes per record, '
+            f'{result["mean_live_bytes"] / 1024:.0f} KiB mean live, '
+            f'{result["peak_traced_bytes"] / 1024:.0f} KiB peak traced, '
+            f'{result["peak_rss_kb"] / 1024:.1f} MiB peak RSS'
+        )
+
+
+if __name__ == "__main__":
+    main()
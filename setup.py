@@ -14,9 +14,13 @@ setup(
         "singer-python",
         "requests",
     ],
+    extras_require={
+        "dev": ["pytest"],
+    },
     entry_points="""
     [console_scripts]
     tap-gorgias=tap_gorgias:main
+    tap-gorgias-regression=tap_gorgias.regression:main
     """,
     packages=["tap_gorgias"],
     package_data = {
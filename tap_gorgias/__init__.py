@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import json
+import time
 import singer
 from singer import utils, metadata
 from singer.catalog import Catalog, CatalogEntry
@@ -76,7 +77,9 @@ def populate_class_schemas(catalog, selected_stream_names):
 
 
 def do_sync(client, catalog, state, config):
+    """ Syncs the selected streams and returns the row count, request count and throughput of each. """
     start_date = config['start_date']
+    stream_stats = {}
 
     selected_stream_names = get_selected_streams(catalog)
     validate_dependencies(selected_stream_names)
@@ -116,12 +119,28 @@ def do_sync(client, catalog, state, config):
 
         LOGGER.info("%s: Starting sync", stream_name)
         instance = STREAMS[stream_name](client, start_date)
+        start_request_count = client.request_count
+        start_time = time.monotonic()
         counter_value = sync_stream(state, start_date, instance, config)
         singer.write_state(state)
-        LOGGER.info("%s: Completed sync (%s rows)", stream_name, counter_value)
+        elapsed = time.monotonic() - start_time
+        stream_stats[stream_name] = {
+            'rows': counter_value,
+            'requests': client.request_count - start_request_count,
+            'seconds': elapsed,
+            'rows_per_sec': counter_value / elapsed if elapsed else 0.0,
+        }
+        LOGGER.info(
+            "%s: Completed sync (%s rows, %s requests, %.1f rows/sec)",
+            stream_name,
+            counter_value,
+            stream_stats[stream_name]['requests'],
+            stream_stats[stream_name]['rows_per_sec']
+        )
 
     singer.write_state(state)
     LOGGER.info("Finished sync")
+    return stream_stats
 
 
 def discover():
@@ -175,7 +194,10 @@ def main():
         else:
             catalog = discover()
         client = GorgiasAPI(args.config)
-        do_sync(client, catalog, args.state, args.config)
+        try:
+            do_sync(client, catalog, args.state, args.config)
+        finally:
+            client.close()
 
 
 if __name__ == "__main__":
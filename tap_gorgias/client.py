@@ -1,3 +1,5 @@
+import datetime
+import gzip
 import json
 import requests
 import requests.exceptions
@@ -5,7 +7,7 @@ import os
 import singer
 import time
 from urllib.parse import ParseResult, parse_qs, urlencode, urlparse, unquote
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 LOGGER = singer.get_logger()
 
@@ -27,6 +29,77 @@ def add_url_params(url: str, query_params: Dict[str, Any]) -> str:
         parsed_url.params, merged_url_encoded_get_args, parsed_url.fragment
     ).geturl())
 
+class FixtureRecorder:
+    """
+    Streams GET responses into a gzipped JSON lines archive. The first line is a
+    header holding the run's utcnow so that replays can pin time-based query params.
+    """
+    # NB: Only non-sensitive headers that describe rate limiting are kept, since
+    # archives are meant to be kept and shared
+    HEADERS = ['Retry-After', 'X-Gorgias-Account-Api-Call-Limit']
+
+    def __init__(self, path: str, utcnow: str):
+        self.path = path
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self._write({'utcnow': utcnow})
+
+    def _write(self, entry: Dict[str, Any]):
+        self.file.write(json.dumps(entry, separators=(',', ':')))
+        self.file.write('\n')
+
+    def attempt(self, resp: requests.Response, elapsed: float) -> Dict[str, Any]:
+        """ Describes a single HTTP attempt, including any retries that failed. """
+        return {
+            'status_code': resp.status_code,
+            'elapsed': elapsed,
+            'headers': {key: resp.headers[key] for key in self.HEADERS if key in resp.headers},
+        }
+
+    def record(self, url: str, attempts: List[Dict[str, Any]], body: Any, elapsed: float):
+        """ Records a request along with its attempts and total time, including time spent waiting to retry. """
+        self._write({
+            'url': url,
+            'attempts': attempts,
+            'elapsed': elapsed,
+            'body': body,
+        })
+
+    def close(self):
+        self.file.close()
+
+
+class FixtureReplayer:
+    """
+    Serves responses back from an archive written by FixtureRecorder.
+
+    The archive is read one entry at a time, so a sync has to issue its
+    requests in the same order as the recorded one.
+    """
+
+    def __init__(self, path: str, replay_latency: bool=False):
+        self.path = path
+        self.replay_latency = replay_latency
+        self.file = gzip.open(path, 'rt', encoding='utf-8')
+        header = self.file.readline()
+        if not header:
+            raise Exception(f'gorgias replay archive {self.path} is empty')
+        self.utcnow = json.loads(header)['utcnow']
+
+    def replay(self, url: str) -> Dict[str, Any]:
+        line = self.file.readline()
+        if not line:
+            raise Exception(f'gorgias replay archive {self.path} exhausted', url)
+        entry = json.loads(line)
+        if entry['url'] != url:
+            raise Exception(f'gorgias replay request mismatch: expected {entry["url"]}', url)
+        if self.replay_latency:
+            time.sleep(entry['elapsed'])
+        return entry
+
+    def close(self):
+        self.file.close()
+
+
 class GorgiasAPI:
     URL_TEMPLATE = 'https://{}.gorgias.com'
     MAX_RETRIES = 10
@@ -36,6 +109,30 @@ class GorgiasAPI:
         self.password = config['password']
         self.subdomain = config['subdomain']
         self.base_url = self.URL_TEMPLATE.format(self.subdomain)
+        # Number of HTTP requests made, including retries
+        self.request_count = 0
+        # Time at which this run started, used to bound time-filtered queries
+        self.utcnow = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+        # Optionally record responses to, or replay them from, a fixture archive
+        # so that a production-shaped sync can be re-run offline
+        self.recorder = None
+        self.replayer = None
+        if config.get('replay_fixtures_path'):
+            self.replayer = FixtureReplayer(
+                config['replay_fixtures_path'],
+                replay_latency=config.get('replay_latency', False)
+            )
+            # Pin the run's start time to the recorded one so that urls match
+            self.utcnow = self.replayer.utcnow
+        elif config.get('record_fixtures_path'):
+            self.recorder = FixtureRecorder(config['record_fixtures_path'], self.utcnow)
+
+    def close(self):
+        if self.recorder:
+            self.recorder.close()
+        if self.replayer:
+            self.replayer.close()
 
     def get(self, url, make_log_on_request: bool=True):
         if not url:
@@ -45,14 +142,26 @@ class GorgiasAPI:
         if not url.startswith('https://'):
             url = f'{self.base_url}{url}'
 
+        if self.replayer:
+            # Normalize the url the same way it was normalized when recorded
+            entry = self.replayer.replay(add_url_params(url, {}))
+            self.request_count += len(entry['attempts'])
+            return entry['body']
+
+        attempts = []
+        start = time.monotonic()
         for num_retries in range(self.MAX_RETRIES):
             if make_log_on_request:
                 LOGGER.info(f'gorgias get request {url}, timeout={DEFAULT_TIMEOUT}')
+            attempt_start = time.monotonic()
             resp = requests.get(
                 url,
                 auth=(self.username, self.password),
                 timeout=DEFAULT_TIMEOUT
             )
+            self.request_count += 1
+            if self.recorder:
+                attempts.append(self.recorder.attempt(resp, time.monotonic() - attempt_start))
             try:
                 # https://developers.gorgias.com/reference/limitations
                 resp.raise_for_status()
@@ -75,7 +184,11 @@ class GorgiasAPI:
             if resp and resp.status_code == 200:
                 break
 
-        return resp.json()
+        body = resp.json()
+        if self.recorder:
+            self.recorder.record(add_url_params(url, {}), attempts, body, time.monotonic() - start)
+
+        return body
 
     def post(self, url, params):
         if not url:
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Replays a fixture archive recorded with `record_fixtures_path` and compares each
+stream's rows/sec and request count against a baseline, e.g. the stats written
+by a replay of the same archive on another commit.
+
+    tap-gorgias-regression --config config.json --catalog catalog.json \\
+        --archive fixtures.jsonl.gz --output stats.json --baseline baseline.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+import singer
+from singer import utils
+from singer.catalog import Catalog
+
+from . import do_sync
+from .client import GorgiasAPI
+
+LOGGER = singer.get_logger()
+DEFAULT_THRESHOLD = 0.1
+
+
+def compare(stats: Dict[str, Any], baseline: Dict[str, Any], threshold: float=DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Returns a description of each regression against the baseline: a stream that's missing,
+    makes more requests, or whose rows/sec dropped by more than the threshold fraction.
+    """
+    regressions = []
+    for stream_name, baseline_stats in baseline.items():
+        stream_stats = stats.get(stream_name)
+        if stream_stats is None:
+            regressions.append(f'{stream_name}: not synced')
+            continue
+        if stream_stats['requests'] > baseline_stats['requests']:
+            regressions.append(
+                f'{stream_name}: {stream_stats["requests"]} requests, baseline {baseline_stats["requests"]}'
+            )
+        min_rows_per_sec = baseline_stats['rows_per_sec'] * (1 - threshold)
+        if stream_stats['rows_per_sec'] < min_rows_per_sec:
+            regressions.append(
+                f'{stream_name}: {stream_stats["rows_per_sec"]:.1f} rows/sec, '
+                f'baseline {baseline_stats["rows_per_sec"]:.1f}'
+            )
+    return regressions
+
+
+def replay(config: Dict[str, Any], catalog: Catalog, state: Dict[str, Any], archive: str,
+           replay_latency: bool=False) -> Dict[str, Any]:
+    """ Syncs from the archive rather than the API and returns the stats of each stream. """
+    config = {**config, 'replay_fixtures_path': archive, 'replay_latency': replay_latency}
+    config.pop('record_fixtures_path', None)
+    client = GorgiasAPI(config)
+    try:
+        # Discard the singer messages, only the stats are of interest
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return do_sync(client, catalog, state, config)
+    finally:
+        client.close()
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', required=True, help='Tap config file')
+    parser.add_argument('--catalog', required=True, help='Catalog file selecting the recorded streams')
+    parser.add_argument('--state', help='State file the recorded run started from')
+    parser.add_argument('--archive', required=True, help='Fixture archive to replay')
+    parser.add_argument('--replay-latency', action='store_true', help='Replay the recorded request timings')
+    parser.add_argument('--output', help='File to write the stats of each stream to, defaults to stdout')
+    parser.add_argument('--baseline', help='Stats file to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed fractional drop in rows/sec before reporting a regression')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    state = utils.load_json(args.state) if args.state else {}
+    stats = replay(
+        utils.load_json(args.config),
+        Catalog.load(args.catalog),
+        state,
+        args.archive,
+        replay_latency=args.replay_latency
+    )
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(stats, file, indent=2)
+    else:
+        json.dump(stats, sys.stdout, indent=2)
+
+    if args.baseline:
+        regressions = compare(stats, utils.load_json(args.baseline), args.threshold)
+        for regression in regressions:
+            LOGGER.error(f'Regression in {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import datetime
+import time
 import singer
 
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from singer.utils import strptime_to_utc, strftime as singer_strftime
 
@@ -10,6 +11,37 @@ from tap_gorgias.client import GorgiasAPI, add_url_params
 LOGGER = singer.get_logger()
 
 
+class GapProgress:
+    """
+    Estimates how far a newest-first walk is through the gap between the newest
+    record and the bookmark, along with an ETA, for each page.
+    """
+
+    def __init__(self, sync_thru: str):
+        self.sync_thru = strptime_to_utc(sync_thru)
+        self.newest = None
+        self.pages = 0
+        self.start_time = time.monotonic()
+
+    def update(self, page_dates: List[str]) -> str:
+        """ Returns a description of the progress to add to the page's log line, if it can be estimated. """
+        self.pages += 1
+        page_dates = [strptime_to_utc(date) for date in page_dates if date]
+        if not page_dates:
+            return ''
+        self.newest = max(self.newest or max(page_dates), max(page_dates))
+        gap = (self.newest - self.sync_thru).total_seconds()
+        covered = (self.newest - min(page_dates)).total_seconds()
+        if gap <= 0 or covered <= 0:
+            return ''
+        fraction = min(covered / gap, 1.0)
+        elapsed = time.monotonic() - self.start_time
+        return (
+            f'{fraction:.1%} of the gap to the bookmark, '
+            f'~{round(self.pages / fraction)} pages in total, ETA {elapsed * (1 - fraction) / fraction:.0f}s'
+        )
+
+
 class CursorStream:
     name = None
     replication_method = None
@@ -20,6 +52,8 @@ class CursorStream:
     datetime_fields = None
     url = None
     results_key = None
+    # Only meaningful for streams listed in descending order of their replication key
+    reports_gap_progress = False
 
     def __init__(self, client: GorgiasAPI, start_date=None):
         self.client: GorgiasAPI = client
@@ -29,9 +63,7 @@ class CursorStream:
             # Don't need to set the start date to before they're founded
             self.start_date = datetime.datetime(2015, 1, 1).strftime('%Y-%m-%d')
         self.start_date = self.reformat_date_datetimes(self.start_date)
-        self.utcnow_iso: str = self.reformat_date_datetimes(
-            datetime.datetime.now(datetime.timezone.utc).isoformat()
-        )
+        self.utcnow_iso: str = self.reformat_date_datetimes(self.client.utcnow)
 
     @property
     def uses_cursor_bookmark(self):
@@ -62,6 +94,14 @@ class CursorStream:
             value = self.reformat_date_datetimes(value)
         return value
 
+    def transform_record(self, record: dict) -> dict:
+        """ Reformat the datetime fields of the record in place, avoiding a copy per row. """
+        for key in self.datetime_fields:
+            value = record.get(key)
+            if value:
+                record[key] = self.reformat_date_datetimes(value)
+        return record
+
     def get_sync_thru_dates(self, state: dict) -> Tuple[str, str]:
         """
         Helper method that gets the bookmark and
@@ -80,8 +120,11 @@ class CursorStream:
         max_synced_thru: str = max(sync_thru, self.start_date)
         return sync_thru, max_synced_thru
 
-    def cursor_get(self, url: str, query_params: Dict[str, Any]):
+    def cursor_get(self, url: str, query_params: Dict[str, Any], sync_thru: Optional[str]=None):
         """ Paginate through the streams list response via the provided cursors. """
+        progress: Optional[GapProgress] = None
+        if self.reports_gap_progress and sync_thru:
+            progress = GapProgress(sync_thru)
         updated_url = add_url_params(url, query_params)
         cursors_seen = set()
         def _get_page(cursor=None):
@@ -107,22 +150,33 @@ class CursorStream:
             # pass an empty cursor to begin
             data = _get_page(next_cursor)
             records = data.get(self.results_key)
+            progress_message = ''
+            if progress and records:
+                progress_message = progress.update([record.get(self.replication_key) for record in records])
             try:
                 # For each page, log the date range of this page
                 page_start_date, page_end_date = (
                     records[0][self.replication_key],
                     records[-1][self.replication_key]
                 )
-                LOGGER.info(f'Fetched {self.name} between {page_start_date} and {page_end_date}')
-            except:
+                if progress_message:
+                    progress_message = f' ({progress_message})'
+                LOGGER.info(f'Fetched {self.name} between {page_start_date} and {page_end_date}{progress_message}')
+            except (IndexError, KeyError, TypeError):
                 pass
 
-            for record in records:
+            # Release the page as soon as possible, and each record once it's been emitted,
+            # so that wide pages aren't kept alive for the whole iteration
+            page_cursor = next_cursor
+            next_cursor = data['meta'].get('next_cursor')
+            del data
+            records.reverse()
+            while records:
+                record = records.pop()
                 if self.uses_cursor_bookmark:
-                    yield (record, next_cursor)
+                    yield (record, page_cursor)
                 else:
                     yield record
-            next_cursor = data['meta'].get('next_cursor')
 
 
 class Tickets(CursorStream):
@@ -138,6 +192,8 @@ class Tickets(CursorStream):
     ])
     results_key = 'data'
     url = '/api/tickets'
+    # NB: Gap progress isn't reported since tickets are listed by created_datetime,
+    # so the updated_datetime replication key isn't monotonic across pages
 
     # There are two APIs that return the same data:
     # 1. the views API, https://developers.gorgias.com/reference/get_api-views
@@ -162,7 +218,7 @@ class Tickets(CursorStream):
         }
         LOGGER.info(f'Starting fetch for {self.name} stopping at {sync_thru}')
         for row in self.cursor_get(self.url, query_params):
-            ticket = {k: self.transform_value(k, v) for (k, v) in row.items()}
+            ticket = self.transform_record(row)
             curr_synced_thru: str = ticket[self.replication_key]
             max_synced_thru = max(curr_synced_thru, max_synced_thru)
             if curr_synced_thru > sync_thru:
@@ -184,6 +240,7 @@ class Messages(CursorStream):
         'deleted_datetime', 'opened_datetime'
     ])
     results_key = 'data'
+    reports_gap_progress = True
     def sync(self, state, config):
         # https://developers.gorgias.com/reference/get_api-messages
 
@@ -195,8 +252,8 @@ class Messages(CursorStream):
             'order_by': 'created_datetime:desc',
         }
         LOGGER.info(f'Starting fetch for {self.name} stopping at {sync_thru}')
-        for row in self.cursor_get(self.url, query_params):
-            message = {k: self.transform_value(k, v) for (k, v) in row.items()}
+        for row in self.cursor_get(self.url, query_params, sync_thru=sync_thru):
+            message = self.transform_record(row)
             curr_synced_thru: str = message[self.replication_key]
             max_synced_thru = max(curr_synced_thru, max_synced_thru)
             if curr_synced_thru > sync_thru:
@@ -218,6 +275,7 @@ class SatisfactionSurveys(CursorStream):
         'should_send_datetime'
     ])
     results_key = 'data'
+    reports_gap_progress = True
 
     def sync(self, state, config):
         # https://developers.gorgias.com/reference/get_api-satisfaction-surveys
@@ -230,8 +288,8 @@ class SatisfactionSurveys(CursorStream):
             'order_by': 'created_datetime:desc',
         }
         LOGGER.info(f'Starting fetch for {self.name} stopping at {sync_thru}')
-        for row in self.cursor_get(self.url, query_params):
-            survey = {k: self.transform_value(k, v) for (k, v) in row.items()}
+        for row in self.cursor_get(self.url, query_params, sync_thru=sync_thru):
+            survey = self.transform_record(row)
             curr_synced_thru: str = survey[self.replication_key]
             max_synced_thru = max(curr_synced_thru, max_synced_thru)
             if curr_synced_thru > sync_thru:
@@ -267,7 +325,7 @@ class Events(CursorStream):
         }
         LOGGER.info(f'Starting fetch for {self.name} between {sync_thru} and {self.utcnow_iso}')
         for row in self.cursor_get(self.url, query_params):
-            event = {k: self.transform_value(k, v) for (k, v) in row.items()}
+            event = self.transform_record(row)
             curr_synced_thru: str = event[self.replication_key]
             max_synced_thru: str = max(curr_synced_thru, max_synced_thru)
             yield (self.stream, event)
@@ -293,7 +351,7 @@ class VoiceCallEvents(CursorStream):
         LOGGER.info(f'Starting fetch for {self.name} at cursor {current_bookmark}')
         cursor = None
         for row, cursor in self.cursor_get(self.url, query_params):
-            event = {k: self.transform_value(k, v) for (k, v) in row.items()}
+            event = self.transform_record(row)
             yield (self.stream, event)
 
         if cursor:
@@ -317,7 +375,7 @@ class VoiceCallRecordings(CursorStream):
         }
         LOGGER.info(f'Starting fetch for {self.name} between {sync_thru} and {self.utcnow_iso}')
         for row in self.cursor_get(self.url, query_params):
-            recording = {k: self.transform_value(k, v) for (k, v) in row.items()}
+            recording = self.transform_record(row)
             curr_synced_thru: str = recording[self.replication_key]
             max_synced_thru = max(curr_synced_thru, max_synced_thru)
             # Stop fetching if the current record is older than or equal to the bookmark
@@ -345,7 +403,7 @@ class VoiceCalls(CursorStream):
         }
         LOGGER.info(f'Starting fetch for {self.name} between {sync_thru} and {self.utcnow_iso}')
         for row in self.cursor_get(self.url, query_params):
-            call = {k: self.transform_value(k, v) for (k, v) in row.items()}
+            call = self.transform_record(row)
             curr_synced_thru: str = call[self.replication_key]
             max_synced_thru = max(curr_synced_thru, max_synced_thru)
             # Stop fetching if the current record is older than or equal to the bookmark
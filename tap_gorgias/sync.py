@@ -20,14 +20,18 @@ def sync_stream(state, start_date, instance, config):
         singer.write_bookmark(state, stream.tap_stream_id, instance.replication_key, start_date)
 
     parent_stream = stream
-    with metrics.record_counter(stream.tap_stream_id) as counter:
+    # Build the schema and metadata maps once per stream rather than once per record
+    mdata_map = metadata.to_map(mdata)
+    schemas = {}
+    with metrics.record_counter(stream.tap_stream_id) as counter, singer.Transformer() as transformer:
         for (stream, record) in instance.sync(state, config):
             # NB: Only count parent records in the case of sub-streams
             if stream.tap_stream_id == parent_stream.tap_stream_id:
                 counter.increment()
 
-            with singer.Transformer() as transformer:
-                rec = transformer.transform(record, stream.schema.to_dict(), metadata=metadata.to_map(mdata))
+            if stream.tap_stream_id not in schemas:
+                schemas[stream.tap_stream_id] = stream.schema.to_dict()
+            rec = transformer.transform(record, schemas[stream.tap_stream_id], metadata=mdata_map)
             singer.write_record(stream.tap_stream_id, rec)
             # NB: We will only write state at the end of a stream's sync:
             #  We may find out that there exists a sync that takes too long and can never emit a bookmark
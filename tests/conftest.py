@@ -0,0 +1,21 @@
+import pytest
+
+from tap_gorgias.client import GorgiasAPI
+
+
+@pytest.fixture
+def config():
+    return {'username': 'user', 'password': 'password', 'subdomain': 'example'}
+
+
+@pytest.fixture
+def client(config):
+    return GorgiasAPI(config)
+
+
+@pytest.fixture
+def page():
+    """ Builds a list response as returned by the Gorgias cursor-paginated endpoints. """
+    def _page(records, next_cursor=None):
+        return {'data': records, 'meta': {'next_cursor': next_cursor}}
+    return _page
@@ -0,0 +1,136 @@
+import gzip
+import json
+from unittest import mock
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from tap_gorgias.client import GorgiasAPI
+from tap_gorgias.streams import Events, Messages
+
+
+def make_response(body, status_code=200, headers=None):
+    headers = CaseInsensitiveDict({
+        'Set-Cookie': 'session=secret',
+        'X-Gorgias-Account-Api-Call-Limit': '1/40',
+        **(headers or {}),
+    })
+    resp = mock.Mock(status_code=status_code, headers=headers, text='')
+    resp.json.return_value = body
+    resp.__bool__ = lambda self: status_code < 400
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = requests.exceptions.HTTPError(status_code)
+    return resp
+
+
+@pytest.fixture
+def event_pages(page):
+    return [
+        page([{'id': 1, 'created_datetime': '2024-01-01T00:00:00+00:00'}], next_cursor='c2'),
+        page([{'id': 2, 'created_datetime': '2024-01-02T00:00:00+00:00'}]),
+    ]
+
+
+def sync_events(client):
+    state = {'bookmarks': {'events': {'created_datetime': '2023-12-01T00:00:00Z'}}}
+    records = [record for (_, record) in Events(client).sync(state, {})]
+    return records, state
+
+
+def record_events(path, config, event_pages):
+    client = GorgiasAPI({**config, 'record_fixtures_path': str(path)})
+    with mock.patch('tap_gorgias.client.requests.get', side_effect=[make_response(p) for p in event_pages]) as get:
+        records, state = sync_events(client)
+    client.close()
+    return records, state, [call.args[0] for call in get.call_args_list]
+
+
+def test_record_and_replay_events_round_trip(tmp_path, config, event_pages):
+    path = tmp_path / 'fixtures.jsonl.gz'
+    recorded, recorded_state, recorded_urls = record_events(path, config, event_pages)
+
+    client = GorgiasAPI({**config, 'replay_fixtures_path': str(path)})
+    with mock.patch('tap_gorgias.client.requests.get') as get:
+        replayed, replayed_state = sync_events(client)
+    client.close()
+
+    get.assert_not_called()
+    assert replayed == recorded
+    assert replayed_state == recorded_state
+    assert client.request_count == len(recorded_urls) == 2
+    assert [line['url'] for line in read_entries(path)] == recorded_urls
+
+
+def test_recorded_archive_only_keeps_rate_limit_headers(tmp_path, config, event_pages):
+    path = tmp_path / 'fixtures.jsonl.gz'
+    record_events(path, config, event_pages)
+    for entry in read_entries(path):
+        assert [attempt['headers'] for attempt in entry['attempts']] == [{'X-Gorgias-Account-Api-Call-Limit': '1/40'}]
+
+
+def test_record_and_replay_retries(tmp_path, config, event_pages):
+    path = tmp_path / 'fixtures.jsonl.gz'
+    responses = [
+        make_response({}, status_code=429, headers={'Retry-After': '2'}),
+        make_response(event_pages[0]),
+        make_response(event_pages[1]),
+    ]
+    client = GorgiasAPI({**config, 'record_fixtures_path': str(path)})
+    with mock.patch('tap_gorgias.client.requests.get', side_effect=responses), \
+            mock.patch('tap_gorgias.client.time.sleep') as sleep, \
+            mock.patch('tap_gorgias.client.time.monotonic', side_effect=range(100)):
+        recorded, _ = sync_events(client)
+    client.close()
+
+    sleep.assert_called_once_with(2)
+    assert client.request_count == 3
+    [first, second] = read_entries(path)
+    assert [attempt['status_code'] for attempt in first['attempts']] == [429, 200]
+    assert first['attempts'][0]['headers']['Retry-After'] == '2'
+    # The total time covers both attempts, which each take one tick of the patched clock
+    assert first['elapsed'] > sum(attempt['elapsed'] for attempt in first['attempts'])
+    assert len(second['attempts']) == 1
+
+    client = GorgiasAPI({**config, 'replay_fixtures_path': str(path)})
+    replayed, _ = sync_events(client)
+    client.close()
+    assert replayed == recorded
+    assert client.request_count == 3
+
+
+def test_replay_raises_on_mismatch(tmp_path, config, event_pages):
+    path = tmp_path / 'fixtures.jsonl.gz'
+    record_events(path, config, event_pages)
+
+    client = GorgiasAPI({**config, 'replay_fixtures_path': str(path)})
+    with pytest.raises(Exception, match='request mismatch'):
+        state = {'bookmarks': {'messages': {'created_datetime': '2023-12-01T00:00:00Z'}}}
+        list(Messages(client).sync(state, {}))
+
+
+def test_replay_raises_when_exhausted(tmp_path, config, event_pages):
+    path = tmp_path / 'fixtures.jsonl.gz'
+    record_events(path, config, event_pages)
+
+    client = GorgiasAPI({**config, 'replay_fixtures_path': str(path)})
+    sync_events(client)
+    with pytest.raises(Exception, match='exhausted'):
+        sync_events(client)
+
+
+def test_replay_latency(tmp_path, config, event_pages):
+    path = tmp_path / 'fixtures.jsonl.gz'
+    record_events(path, config, event_pages)
+    elapsed = [entry['elapsed'] for entry in read_entries(path)]
+
+    client = GorgiasAPI({**config, 'replay_fixtures_path': str(path), 'replay_latency': True})
+    with mock.patch('tap_gorgias.client.time.sleep') as sleep:
+        sync_events(client)
+    assert [call.args[0] for call in sleep.call_args_list] == elapsed
+
+
+def read_entries(path):
+    with gzip.open(path, 'rt') as file:
+        # Skip the header
+        return [json.loads(line) for line in file.readlines()[1:]]
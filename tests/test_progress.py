@@ -0,0 +1,55 @@
+from unittest import mock
+
+import pytest
+from dateutil.parser import ParserError
+
+from tap_gorgias.streams import GapProgress, Messages, Tickets
+
+
+def dated(dates):
+    return [{'id': i, 'created_datetime': date, 'updated_datetime': date} for (i, date) in enumerate(dates)]
+
+
+def test_gap_progress_estimates_from_newest_record():
+    progress = GapProgress('2024-01-01T00:00:00Z')
+    # The newest record isn't necessarily the first one on the page
+    message = progress.update(['2024-01-09T00:00:00Z', '2024-01-11T00:00:00Z', '2024-01-06T00:00:00Z'])
+    assert progress.newest.isoformat() == '2024-01-11T00:00:00+00:00'
+    assert message.startswith('50.0% of the gap to the bookmark, ~2 pages in total, ETA ')
+
+
+def test_progress_is_added_to_the_page_log_line(client, page):
+    with mock.patch.object(client, 'get', return_value=page(dated(['2024-01-11T00:00:00Z', '2024-01-06T00:00:00Z']))), \
+            mock.patch('tap_gorgias.streams.LOGGER') as logger:
+        list(Messages(client).cursor_get(Messages.url, {}, sync_thru='2024-01-01T00:00:00Z'))
+    [message] = [call.args[0] for call in logger.info.call_args_list]
+    assert message.startswith(
+        'Fetched messages between 2024-01-11T00:00:00Z and 2024-01-06T00:00:00Z (50.0% of the gap to the bookmark'
+    )
+
+
+def test_cursor_get_reports_progress_for_opted_in_streams(client, page):
+    pages = [
+        page(dated(['2024-01-11T00:00:00Z', '2024-01-06T00:00:00Z']), next_cursor='c2'),
+        page(dated(['2024-01-03T00:00:00Z'])),
+    ]
+    with mock.patch.object(client, 'get', side_effect=pages), \
+            mock.patch.object(GapProgress, 'update', return_value='') as update:
+        list(Messages(client).cursor_get(Messages.url, {}, sync_thru='2024-01-01T00:00:00Z'))
+    assert [call.args[0] for call in update.call_args_list] == [
+        ['2024-01-11T00:00:00Z', '2024-01-06T00:00:00Z'],
+        ['2024-01-03T00:00:00Z'],
+    ]
+
+
+def test_tickets_do_not_report_progress(client, page):
+    with mock.patch.object(client, 'get', return_value=page(dated(['2024-01-11T00:00:00Z']))), \
+            mock.patch.object(GapProgress, 'update', return_value='') as update:
+        list(Tickets(client).cursor_get(Tickets.url, {}, sync_thru='2024-01-01T00:00:00Z'))
+    update.assert_not_called()
+
+
+def test_progress_errors_are_not_swallowed(client, page):
+    with mock.patch.object(client, 'get', return_value=page(dated(['not a date']))):
+        with pytest.raises(ParserError):
+            list(Messages(client).cursor_get(Messages.url, {}, sync_thru='2024-01-01T00:00:00Z'))
@@ -0,0 +1,33 @@
+import copy
+from unittest import mock
+
+from tap_gorgias.streams import Messages, Tickets, VoiceCallEvents
+
+
+def test_transform_record_matches_transform_value(client):
+    row = {
+        'id': 1,
+        'created_datetime': '2024-01-01T10:00:00+02:00',
+        'updated_datetime': '2024-01-02T10:00:00+02:00',
+        # NB: Tickets lists this typo in its datetime_fields rather than updated_datetime
+        'updated_datime': '2024-01-03T10:00:00+02:00',
+        'closed_datetime': None,
+        'subject': 'hello',
+    }
+    for stream_class in (Tickets, Messages):
+        instance = stream_class(client)
+        expected = {k: instance.transform_value(k, v) for (k, v) in row.items()}
+        assert instance.transform_record(copy.deepcopy(row)) == expected
+
+    assert Tickets(client).transform_record(copy.deepcopy(row))['updated_datetime'] == row['updated_datetime']
+
+
+def test_cursor_bookmark_yields_cursor_of_emitted_page(client, page):
+    pages = [
+        page([{'id': 1}, {'id': 2}], next_cursor='c2'),
+        page([{'id': 3}], next_cursor='c3'),
+        page([{'id': 4}]),
+    ]
+    with mock.patch.object(client, 'get', side_effect=pages):
+        rows = list(VoiceCallEvents(client).cursor_get('/api/phone/voice-call-events', {'limit': 100}))
+    assert [(row['id'], cursor) for (row, cursor) in rows] == [(1, None), (2, None), (3, 'c2'), (4, 'c3')]
@@ -0,0 +1,85 @@
+import json
+from unittest import mock
+
+import pytest
+from singer import metadata
+
+from tap_gorgias import discover
+from tap_gorgias.client import GorgiasAPI
+from tap_gorgias.regression import compare, main
+from tap_gorgias.streams import STREAMS
+
+STATE = {'bookmarks': {'events': {'created_datetime': '2023-12-01T00:00:00Z'}}}
+
+
+def stats(rows_per_sec=100.0, requests=2):
+    return {'events': {'rows': 2, 'requests': requests, 'seconds': 0.02, 'rows_per_sec': rows_per_sec}}
+
+
+def test_compare_within_threshold():
+    assert compare(stats(rows_per_sec=95.0), stats(), threshold=0.1) == []
+
+
+def test_compare_reports_regressions():
+    assert compare(stats(rows_per_sec=80.0, requests=3), stats(), threshold=0.1) == [
+        'events: 3 requests, baseline 2',
+        'events: 80.0 rows/sec, baseline 100.0',
+    ]
+    assert compare({}, stats()) == ['events: not synced']
+
+
+@pytest.fixture
+def recorded_run(tmp_path, config, page):
+    """ Records a sync of the events stream and returns the files needed to replay it. """
+    config = {**config, 'start_date': '2023-12-01T00:00:00Z'}
+    catalog = discover()
+    for entry in catalog.streams:
+        if entry.tap_stream_id == 'events':
+            entry.metadata = metadata.to_list(metadata.write(metadata.to_map(entry.metadata), (), 'selected', True))
+    pages = [
+        page([{'id': 1, 'created_datetime': '2024-01-01T00:00:00+00:00'}], next_cursor='c2'),
+        page([{'id': 2, 'created_datetime': '2024-01-02T00:00:00+00:00'}]),
+    ]
+    paths = {name: tmp_path / f'{name}.json' for name in ('config', 'catalog', 'state', 'stats')}
+    paths['archive'] = tmp_path / 'fixtures.jsonl.gz'
+
+    client = GorgiasAPI({**config, 'record_fixtures_path': str(paths['archive'])})
+    responses = [mock.Mock(status_code=200, headers={}, **{'json.return_value': p}) for p in pages]
+    with mock.patch('tap_gorgias.client.requests.get', side_effect=responses), \
+            mock.patch('singer.write_message'):
+        list(STREAMS['events'](client).sync(json.loads(json.dumps(STATE)), config))
+    client.close()
+
+    paths['config'].write_text(json.dumps(config))
+    paths['catalog'].write_text(json.dumps(catalog.to_dict()))
+    paths['state'].write_text(json.dumps(STATE))
+    yield paths
+    for stream_class in STREAMS.values():
+        stream_class.stream = None
+
+
+def run(paths, *extra_args):
+    main([
+        '--config', str(paths['config']),
+        '--catalog', str(paths['catalog']),
+        '--state', str(paths['state']),
+        '--archive', str(paths['archive']),
+        '--output', str(paths['stats']),
+        *extra_args
+    ])
+    return json.loads(paths['stats'].read_text())
+
+
+def test_replay_writes_stream_stats(recorded_run):
+    result = run(recorded_run)
+    assert list(result) == ['events']
+    assert result['events']['rows'] == 2
+    assert result['events']['requests'] == 2
+
+
+def test_replay_exits_on_regression_against_baseline(recorded_run, tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(stats(requests=1)))
+    with pytest.raises(SystemExit) as exit_info:
+        run(recorded_run, '--baseline', str(baseline))
+    assert exit_info.value.code == 1